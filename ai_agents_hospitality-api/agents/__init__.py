@@ -4,7 +4,19 @@ Agents module for AI Hospitality API.
 This module contains implementations of various AI agents for the hospitality domain.
 """
 
-from .hotel_simple_agent import answer_hotel_question, load_hotel_data
+from .hotel_simple_agent import (
+    AgentResult,
+    answer_hotel_question,
+    answer_hotel_question_async,
+    answer_hotel_question_result_async,
+    load_hotel_data,
+)
 
-__all__ = ["answer_hotel_question", "load_hotel_data"]
+__all__ = [
+    "AgentResult",
+    "answer_hotel_question",
+    "answer_hotel_question_async",
+    "answer_hotel_question_result_async",
+    "load_hotel_data",
+]
 
@@ -9,10 +9,16 @@ Uses a small sample of 3 hotels for learning purposes.
 """
 
 import asyncio
+import atexit
+import hashlib
 import json
 import os
+import re
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Dict, Literal, Optional, Tuple
 
 try:
     # Try new LangChain structure (v0.2+)
@@ -33,9 +39,21 @@ try:
 except ImportError:
     ChatOpenAI = None
 
+# Faster JSON parsing (optional); falls back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx is installed with langchain-openai; used to share a keep-alive connection pool
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 from util.configuration import PROJECT_ROOT
 from util.logger_config import logger
-from config.agent_config import get_agent_config
+from config.agent_config import AgentConfig, get_agent_config
 
 # Path to hotel data files (relative to project root)
 # First try local data directory (for Docker), then fallback to bookings-db
@@ -58,11 +76,72 @@ def _get_hotels_data_path():
         logger.info(f"Using external hotel data path: {HOTELS_DATA_PATH_EXTERNAL}")
         return HOTELS_DATA_PATH_EXTERNAL
 
+@dataclass(frozen=True)
+class AgentResult:
+    """Outcome of an agent invocation."""
+    
+    status: Literal["ok", "error"]
+    text: str  # Markdown answer, or markdown error message when status is "error"
+
+
+class AgentError(Exception):
+    """Raised by the streaming entry point when the agent cannot answer."""
+    
+    def __init__(self, result: AgentResult):
+        super().__init__(result.text)
+        self.result = result  # Error result with the markdown message for the user
+
+
 # Global variables to cache loaded data and agent
 _hotels_data: Optional[dict] = None
 _hotel_details_text: Optional[str] = None
 _agent_chain = None
 
+# Serializes the one-time initialization of the cached data and chain, so a burst
+# of first requests does not load files or build LLM clients several times.
+# Reentrant because building the chain loads the hotel data.
+_INIT_LOCK = threading.RLock()
+
+# Retries (with the client's exponential backoff) on transient 429/5xx errors and
+# per-request timeout for LLM calls
+LLM_MAX_RETRIES = int(os.getenv("HOSPITALITY_LLM_MAX_RETRIES", "3"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("HOSPITALITY_LLM_TIMEOUT", "30"))
+
+# System prompt of the agent.
+# Static instructions go first and the hotel data (identical on every call)
+# right after, so the whole system message is a stable prefix that providers
+# can cache; the question is the only part that varies per request.
+_SYSTEM_PROMPT = """\
+You are a helpful hotel assistant. Use the hotel information below to answer questions.
+
+When answering questions:
+- Be accurate and specific
+- Reference hotel names, locations, and details from the data
+- If information is not available, say so clearly
+- Format responses in a clear, readable way using markdown
+- Use bullet points and tables when appropriate
+- Include specific prices, addresses, and details when available
+
+Hotel Data:
+{hotel_context}"""
+
+# In-process answer cache: key -> (stored_at, answer). Opt-in via HOSPITALITY_ANSWER_CACHE=1
+ANSWER_CACHE_ENABLED = os.getenv("HOSPITALITY_ANSWER_CACHE", "0") == "1"
+ANSWER_CACHE_MAX_ENTRIES = 512
+ANSWER_CACHE_TTL_SECONDS = 1800
+_answer_cache: Dict[str, Tuple[float, str]] = {}
+
+# Persistent LLM cache shared across processes/restarts. Opt-in via HOSPITALITY_LLM_CACHE=1,
+# and only used with temperature 0
+LLM_CACHE_ENABLED = os.getenv("HOSPITALITY_LLM_CACHE", "0") == "1"
+LLM_CACHE_PATH = os.getenv("LC_CACHE_PATH", str(PROJECT_ROOT / ".lc_cache.db"))
+
+# Punctuation that does not change a question's meaning. Currency signs, %, < and >
+# are kept, and so are separators inside numbers ("€99.50", "1,000"), so that questions
+# that only differ in those never share a cache entry.
+_PUNCTUATION_RE = re.compile(r"""[?!;:"'`¿¡()\[\]{}]|[.,-](?!\d)""")
+_WHITESPACE_RE = re.compile(r"\s+")
+
 
 def load_hotel_data() -> Tuple[dict, str]:
     """
@@ -81,6 +160,25 @@ def load_hotel_data() -> Tuple[dict, str]:
     if _hotels_data is not None and _hotel_details_text is not None:
         return _hotels_data, _hotel_details_text
     
+    with _INIT_LOCK:
+        # Another thread may have loaded the data while we waited for the lock
+        if _hotels_data is None or _hotel_details_text is None:
+            _hotels_data, _hotel_details_text = _read_hotel_data_files()
+    
+    return _hotels_data, _hotel_details_text
+
+
+def _read_hotel_data_files() -> Tuple[dict, str]:
+    """
+    Read hotel data from the JSON and markdown files on disk.
+    
+    Returns:
+        tuple: (hotels_data dict, hotel_details_text str)
+        
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+        json.JSONDecodeError: If hotels.json is invalid
+    """
     # Determine the correct path to hotel data
     hotels_data_path = _get_hotels_data_path()
     hotels_json_file = hotels_data_path / "hotels.json"
@@ -111,17 +209,193 @@ def load_hotel_data() -> Tuple[dict, str]:
     
     # Load JSON data
     logger.info(f"Loading hotel data from {hotels_json_file}")
-    with open(hotels_json_file, 'r', encoding='utf-8') as f:
-        _hotels_data = json.load(f)
+    if orjson is not None:
+        # orjson parses straight from bytes, skipping the str decode step
+        hotels_data = orjson.loads(hotels_json_file.read_bytes())
+    else:
+        with open(hotels_json_file, 'r', encoding='utf-8') as f:
+            hotels_data = json.load(f)
     
     # Load markdown details
     logger.info(f"Loading hotel details from {hotel_details_file}")
     with open(hotel_details_file, 'r', encoding='utf-8') as f:
-        _hotel_details_text = f.read()
+        hotel_details_text = f.read()
     
-    logger.info(f"Successfully loaded hotel data ({len(_hotels_data.get('hotels', []))} hotels)")
+    logger.info(f"Successfully loaded hotel data ({len(hotels_data.get('hotels', []))} hotels)")
     
-    return _hotels_data, _hotel_details_text
+    return hotels_data, hotel_details_text
+
+
+def _normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings share a cache entry.
+    Lowercases, strips punctuation (see _PUNCTUATION_RE) and collapses whitespace.
+    
+    Args:
+        question: User's question
+        
+    Returns:
+        str: Normalized question
+    """
+    question = _PUNCTUATION_RE.sub(" ", question.lower())
+    return _WHITESPACE_RE.sub(" ", question).strip()
+
+
+def _answer_cache_key(question: str) -> str:
+    """Build the answer cache key for a question."""
+    normalized = _normalize_question(question)
+    return hashlib.sha256(f"simple:{normalized}".encode()).hexdigest()
+
+
+def _get_cached_answer(key: str) -> Optional[str]:
+    """
+    Return a cached answer if present and not expired.
+    
+    Args:
+        key: Answer cache key
+        
+    Returns:
+        Cached answer or None
+    """
+    entry = _answer_cache.get(key)
+    if entry is None:
+        return None
+    
+    stored_at, answer = entry
+    if time.time() - stored_at > ANSWER_CACHE_TTL_SECONDS:
+        _answer_cache.pop(key, None)
+        return None
+    
+    return answer
+
+
+def _store_cached_answer(key: str, answer: str) -> None:
+    """
+    Store an answer in the cache, evicting the oldest entries when full.
+    
+    Args:
+        key: Answer cache key
+        answer: Agent's answer
+    """
+    _answer_cache.pop(key, None)
+    _answer_cache[key] = (time.time(), answer)
+    
+    # Dicts keep insertion order, so the first key is the oldest entry
+    while len(_answer_cache) > ANSWER_CACHE_MAX_ENTRIES:
+        _answer_cache.pop(next(iter(_answer_cache)), None)
+
+
+def enable_llm_cache() -> None:
+    """
+    Enable LangChain's SQLite-backed LLM cache, if opted in.
+    
+    Meant to be called once at application startup. Only deterministic
+    (temperature 0) generations are cached, since a cached answer would
+    otherwise hide the sampling variance.
+    """
+    if not LLM_CACHE_ENABLED:
+        return
+    
+    # Imported only when opted in: langchain-community is optional and
+    # warns about its deprecation on import
+    try:
+        from langchain_community.cache import SQLiteCache
+        from langchain_core.globals import set_llm_cache
+    except ImportError:
+        logger.warning("LLM cache not available. Install langchain-community to enable it.")
+        return
+    
+    try:
+        temperature = get_agent_config().temperature
+    except ValueError as e:
+        logger.warning(f"LLM cache disabled: {e}")
+        return
+    
+    if temperature != 0:
+        logger.info(f"LLM cache disabled (temperature={temperature})")
+        return
+    
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+    logger.info(f"LLM cache enabled at {LLM_CACHE_PATH}")
+
+
+# Async HTTP clients handed to chat models, closed by close_http_clients()
+_async_http_clients: list = []
+
+
+def _openai_http_clients() -> dict:
+    """
+    Build shared keep-alive HTTP clients for the OpenAI chat model.
+    
+    One pooled client per sync/async path lets concurrent requests reuse
+    connections instead of paying a TLS handshake per call. The sync client
+    is closed at interpreter exit; the async one needs a running event loop,
+    so it is closed by close_http_clients() at application shutdown.
+    
+    Returns:
+        dict: Keyword arguments for ChatOpenAI (empty if httpx is unavailable)
+    """
+    if httpx is None:
+        return {}
+    
+    limits = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+    http_client = httpx.Client(limits=limits, timeout=LLM_TIMEOUT_SECONDS)
+    atexit.register(http_client.close)
+    http_async_client = httpx.AsyncClient(limits=limits, timeout=LLM_TIMEOUT_SECONDS)
+    _async_http_clients.append(http_async_client)
+    return {
+        "http_client": http_client,
+        "http_async_client": http_async_client
+    }
+
+
+async def close_http_clients() -> None:
+    """
+    Close the pooled async HTTP clients of the chat model.
+    
+    Meant to be called once at application shutdown, on the event loop
+    that used the clients.
+    """
+    while _async_http_clients:
+        await _async_http_clients.pop().aclose()
+
+
+def _build_openai_llm(config: AgentConfig):
+    """Create the OpenAI chat model for the given configuration."""
+    # Standard OpenAI API
+    if not ChatOpenAI:
+        raise ImportError("langchain_openai is required for OpenAI provider. Install with: pip install langchain-openai")
+    llm = ChatOpenAI(
+        model=config.model,
+        temperature=config.temperature,
+        api_key=config.api_key,
+        max_retries=LLM_MAX_RETRIES,
+        timeout=LLM_TIMEOUT_SECONDS,
+        **_openai_http_clients()
+    )
+    logger.info(f"Using OpenAI API with model: {config.model}")
+    return llm
+
+
+def _build_gemini_llm(config: AgentConfig):
+    """Create the Gemini chat model for the given configuration."""
+    # Standard Gemini API usage
+    llm = ChatGoogleGenerativeAI(
+        model=config.model,
+        temperature=config.temperature,
+        google_api_key=config.api_key,
+        max_retries=LLM_MAX_RETRIES,
+        timeout=LLM_TIMEOUT_SECONDS
+    )
+    logger.info(f"Using Gemini API with model: {config.model}")
+    return llm
+
+
+# Chat model constructors by configured provider
+_LLM_BUILDERS = {
+    "openai": _build_openai_llm,
+    "gemini": _build_gemini_llm,
+}
 
 
 def _create_agent_chain():
@@ -136,125 +410,281 @@ def _create_agent_chain():
     if _agent_chain is not None:
         return _agent_chain
     
+    with _INIT_LOCK:
+        # Another thread may have built the chain while we waited for the lock
+        if _agent_chain is None:
+            _agent_chain = _build_agent_chain()
+    
+    return _agent_chain
+
+
+def _build_agent_chain():
+    """
+    Build the LangChain agent chain: hotel context prompt + configured LLM.
+    
+    Returns:
+        LangChain chain: Prompt template + LLM chain
+    """
+    # The hotel context never changes while the process runs, so it is
+    # serialized once here and baked into the prompt
+    hotel_context = _build_hotel_context()
+    
     # Load configuration from centralized config system
     config = get_agent_config()
     
     # Create LLM instance based on provider and configuration
-    if config.provider == "openai":
-        # Standard OpenAI API
-        if not ChatOpenAI:
-            raise ImportError("langchain_openai is required for OpenAI provider. Install with: pip install langchain-openai")
-        llm = ChatOpenAI(
-            model=config.model,
-            temperature=config.temperature,
-            api_key=config.api_key
-        )
-        logger.info(f"Using OpenAI API with model: {config.model}")
-    else:
-        # Standard Gemini API usage
-        llm = ChatGoogleGenerativeAI(
-            model=config.model,
-            temperature=config.temperature,
-            google_api_key=config.api_key
+    build_llm = _LLM_BUILDERS.get(config.provider)
+    if build_llm is None:
+        raise ValueError(
+            f"Invalid provider: {config.provider}. "
+            f"Must be one of: {', '.join(_LLM_BUILDERS)}"
         )
-        logger.info(f"Using Gemini API with model: {config.model}")
+    llm = build_llm(config)
     
     # Create prompt template
     prompt_template = ChatPromptTemplate.from_messages([
-        ("system", """You are a helpful hotel assistant. Use the following hotel information to answer questions.
-
-Hotel Data:
-{hotel_context}
-
-When answering questions:
-- Be accurate and specific
-- Reference hotel names, locations, and details from the data
-- If information is not available, say so clearly
-- Format responses in a clear, readable way using markdown
-- Use bullet points and tables when appropriate
-- Include specific prices, addresses, and details when available"""),
+        ("system", _SYSTEM_PROMPT),
         ("human", "{question}")
-    ])
+    ]).partial(hotel_context=hotel_context)
     
     # Create the chain
-    _agent_chain = prompt_template | llm
+    return prompt_template | llm
+
+
+def _build_hotel_context() -> str:
+    """
+    Build the hotel context embedded in the agent prompt.
     
-    return _agent_chain
+    Returns:
+        str: Hotel details markdown followed by the hotels JSON
+        
+    Raises:
+        FileNotFoundError: If hotel data files don't exist
+    """
+    # Load hotel data
+    hotels_data, hotel_details_text = load_hotel_data()
+    
+    # Prepare context from loaded files.
+    # The JSON is serialized compactly: indentation only adds prompt tokens.
+    return f"""
+{hotel_details_text}
 
+Hotels JSON Summary:
+{json.dumps(hotels_data, separators=(",", ":"), ensure_ascii=False)}
+"""
 
-def answer_hotel_question(question: str) -> str:
+
+async def _get_agent_chain_async():
+    """
+    Return the agent chain, creating it in a worker thread on first use.
+    
+    Returns:
+        LangChain chain: Prompt template + LLM chain
+    """
+    if _agent_chain is not None:
+        return _agent_chain
+    
+    return await asyncio.to_thread(_create_agent_chain)
+
+
+def _error_result(error: Exception) -> AgentResult:
+    """
+    Convert an agent error into an error result with a message for the user.
+    
+    Args:
+        error: Exception raised while answering
+        
+    Returns:
+        AgentResult: Error result with a markdown message
+    """
+    if isinstance(error, FileNotFoundError):
+        logger.error("Hotel data files not found: %s", error)
+        return AgentResult("error", f"""❌ **Error**: Hotel data files not found.
+
+Please generate the hotel data first:
+```bash
+cd bookings-db
+python src/gen_synthetic_hotels.py --num_hotels 3
+```
+
+Then restart the API server.""")
+    
+    if isinstance(error, ValueError):
+        logger.error("Configuration error: %s", error)
+        return AgentResult("error", f"""❌ **Error**: {str(error)}""")
+    
+    logger.error("Error processing question: %s", error, exc_info=True)
+    return AgentResult("error", f"""❌ **Error**: An unexpected error occurred while processing your question.
+
+Error details: {str(error)}
+
+Please try again or contact support if the problem persists.""")
+
+
+def _lookup_cached_answer(question: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Look up a question in the answer cache, if enabled.
+    
+    Args:
+        question: User's question
+        
+    Returns:
+        tuple: (cache key or None when caching is disabled, cached answer or None)
+    """
+    if not ANSWER_CACHE_ENABLED:
+        return None, None
+    
+    cache_key = _answer_cache_key(question)
+    cached_answer = _get_cached_answer(cache_key)
+    if cached_answer is not None:
+        logger.info("Answer cache hit for question: %.100s...", question)
+    return cache_key, cached_answer
+
+
+def _remember_answer(cache_key: Optional[str], result: AgentResult) -> None:
+    """Store an answer in the cache unless caching is disabled or it is an error."""
+    # Never cache errors, so the next attempt can succeed
+    if cache_key is not None and result.status == "ok":
+        _store_cached_answer(cache_key, result.text)
+
+
+def _answer_hotel_question_result(question: str) -> AgentResult:
     """
     Simple agent that answers questions using hotel files as context.
     
     This function loads hotel data and uses it as context for the LLM
     to answer questions about hotels, rooms, and configurations.
+    Errors are reported through the result status instead of raising.
     
     Args:
         question: User's question about hotels
         
     Returns:
-        str: Agent's response
-        
-    Raises:
-        FileNotFoundError: If hotel data files don't exist
-        ValueError: If configuration is invalid or missing required values
+        AgentResult: Agent's response and whether it succeeded
     """
+    cache_key, cached_answer = _lookup_cached_answer(question)
+    if cached_answer is not None:
+        return AgentResult("ok", cached_answer)
+    
     try:
-        # Load hotel data
-        hotels_data, hotel_details_text = load_hotel_data()
-        
-        # Prepare context from loaded files
-        hotel_context = f"""
-{hotel_details_text}
-
-Hotels JSON Summary:
-{json.dumps(hotels_data, indent=2, ensure_ascii=False)}
-"""
-        
-        # Create agent chain
         chain = _create_agent_chain()
         
         # Invoke the chain
-        logger.info(f"Processing question: {question[:100]}...")
-        response = chain.invoke({
-            "hotel_context": hotel_context,
-            "question": question
-        })
+        logger.info("Processing question: %.100s...", question)
+        response = chain.invoke({"question": question})
+        result = AgentResult("ok", response.content)
         
-        return response.content
+    except Exception as e:
+        result = _error_result(e)
+    
+    _remember_answer(cache_key, result)
+    return result
+
+
+def answer_hotel_question(question: str) -> str:
+    """
+    Simple agent that answers questions using hotel files as context.
+    
+    Args:
+        question: User's question about hotels
         
-    except FileNotFoundError as e:
-        logger.error(f"Hotel data files not found: {e}")
-        return f"""❌ **Error**: Hotel data files not found.
+    Returns:
+        str: Agent's response, or a markdown error message
+    """
+    return _answer_hotel_question_result(question).text
 
-Please generate the hotel data first:
-```bash
-cd bookings-db
-python src/gen_synthetic_hotels.py --num_hotels 3
-```
 
-Then restart the API server."""
+async def answer_hotel_question_result_async(question: str) -> AgentResult:
+    """
+    Async version of _answer_hotel_question_result.
     
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        return f"""❌ **Error**: {str(e)}"""
+    The LLM call uses the chain's native async API, so no thread is held
+    while waiting for the provider. Only the first-use chain creation
+    (data loading and client setup) runs in a worker thread.
     
+    Args:
+        question: User's question about hotels
+        
+    Returns:
+        AgentResult: Agent's response and whether it succeeded
+    """
+    cache_key, cached_answer = _lookup_cached_answer(question)
+    if cached_answer is not None:
+        return AgentResult("ok", cached_answer)
+    
+    try:
+        chain = await _get_agent_chain_async()
+        
+        # Invoke the chain
+        logger.info("Processing question: %.100s...", question)
+        response = await chain.ainvoke({"question": question})
+        result = AgentResult("ok", response.content)
+        
     except Exception as e:
-        logger.error(f"Error processing question: {e}", exc_info=True)
-        return f"""❌ **Error**: An unexpected error occurred while processing your question.
+        result = _error_result(e)
+    
+    _remember_answer(cache_key, result)
+    return result
+
 
-Error details: {str(e)}
+async def answer_hotel_question_async(question: str) -> str:
+    """
+    Async version of answer_hotel_question.
+    
+    Args:
+        question: User's question about hotels
+        
+    Returns:
+        str: Agent's response, or a markdown error message
+    """
+    return (await answer_hotel_question_result_async(question)).text
 
-Please try again or contact support if the problem persists."""
+
+async def stream_hotel_answer(question: str) -> AsyncIterator[str]:
+    """
+    Stream the agent's answer as it is generated.
+    
+    Yields text chunks from the chain's async stream so the client can start
+    rendering after the first token instead of waiting for the full answer.
+    
+    Args:
+        question: User's question about hotels
+        
+    Yields:
+        str: Consecutive chunks of the answer
+        
+    Raises:
+        AgentError: If the answer cannot be generated, possibly after some
+            chunks were already yielded. Its result holds the error message.
+    """
+    cache_key, cached_answer = _lookup_cached_answer(question)
+    if cached_answer is not None:
+        yield cached_answer
+        return
+    
+    parts = []
+    try:
+        chain = await _get_agent_chain_async()
+        
+        logger.info("Streaming answer for question: %.100s...", question)
+        async for chunk in chain.astream({"question": question}):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+    
+    except Exception as e:
+        raise AgentError(_error_result(e)) from e
+    
+    _remember_answer(cache_key, AgentResult("ok", "".join(parts)))
 
 
 async def handle_hotel_query_simple(user_query: str) -> str:
     """
     Handle hotel queries using simple file context approach.
     
-    This is the async wrapper for the WebSocket API integration.
-    Executes the synchronous agent function in a thread pool to avoid
-    blocking the event loop.
+    This is the async entry point for the WebSocket API integration.
+    It awaits the native async agent, so the event loop keeps serving
+    other connections while the LLM call is in flight.
     
     Args:
         user_query: User's query string
@@ -262,8 +692,26 @@ async def handle_hotel_query_simple(user_query: str) -> str:
     Returns:
         str: Formatted response from the agent
     """
-    # Run the synchronous function in a thread pool to avoid blocking
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(None, answer_hotel_question, user_query)
-    return response
+    return await answer_hotel_question_async(user_query)
+
+
+def warm_up_agent() -> None:
+    """
+    Build the agent chain ahead of the first question.
+    
+    Loads the hotel data, serializes the prompt context and creates the LLM
+    client, so the first user request does not pay for it. Failures are only
+    logged: the same error is reported to the user on the first question.
+    """
+    try:
+        _create_agent_chain()
+        logger.info("Hotel agent warm-up completed")
+    except Exception as e:
+        logger.warning(f"Hotel agent warm-up skipped: {e}")
+
 
+# Warm up in the background at import so cold start overlaps with the rest of the
+# application startup. _INIT_LOCK makes early requests wait for this work
+# instead of repeating it.
+if os.getenv("HOSPITALITY_WARMUP", "1") == "1":
+    threading.Thread(target=warm_up_agent, name="hosp-warmup", daemon=True).start()
@@ -11,9 +11,14 @@ Exercise 0 Implementation:
 - Integrates with WebSocket API for real-time chat
 """
 
+import asyncio
+import gzip
 import json
+import os
 import re
+import uuid as uuid_lib
 from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Tuple
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.requests import Request
 from fastapi.staticfiles import StaticFiles
@@ -22,26 +27,59 @@ from fastapi.templating import Jinja2Templates
 from util.logger_config import logger
 from util.configuration import settings, PROJECT_ROOT
 
-# Import Exercise 0 agent
-EXERCISE_0_AVAILABLE = False
+# Faster JSON (de)serialization of WebSocket messages (optional)
 try:
-    from agents.hotel_simple_agent import handle_hotel_query_simple, load_hotel_data
-    # Try to load hotel data to verify everything is set up correctly
-    try:
-        load_hotel_data()
-        EXERCISE_0_AVAILABLE = True
-        logger.info("✅ Exercise 0 agent loaded successfully and hotel data verified")
-    except Exception as e:
-        logger.warning(f"Exercise 0 agent code loaded but data/files not ready: {e}")
-        logger.warning("Will use hardcoded responses until hotel data is available")
-        EXERCISE_0_AVAILABLE = False
+    import orjson
+except ImportError:
+    orjson = None
+
+# Import Exercise 0 agent; its hotel data is verified at startup (see lifespan)
+EXERCISE_0_IMPORTED = False
+try:
+    from agents.hotel_simple_agent import (
+        AgentError,
+        AgentResult,
+        answer_hotel_question_result_async,
+        close_http_clients,
+        enable_llm_cache,
+        load_hotel_data,
+        stream_hotel_answer,
+    )
+    EXERCISE_0_IMPORTED = True
 except ImportError as e:
     logger.warning(f"Exercise 0 agent not available (ImportError): {e}")
     logger.warning("Using hardcoded responses. Install LangChain dependencies if needed.")
-    EXERCISE_0_AVAILABLE = False
 except Exception as e:
     logger.warning(f"Error loading Exercise 0 agent: {e}. Using hardcoded responses.")
-    EXERCISE_0_AVAILABLE = False
+
+# Set at startup once the agent's hotel data has been loaded
+EXERCISE_0_AVAILABLE = False
+
+AgentChain = Tuple[Tuple[str, Callable[[str], Awaitable["AgentResult"]]], ...]
+StreamAgentChain = Tuple[Tuple[str, Callable[[str], AsyncIterator[str]]], ...]
+
+# Agents tried in order for each query, fixed at startup from the availability flags.
+# If none is available or all of them fail, the hardcoded responses are used.
+AGENT_CHAIN: AgentChain = ()
+
+# Stream agent answers chunk by chunk instead of sending them in a single message
+STREAMING_ENABLED = os.getenv("HOSPITALITY_STREAMING", "0") == "1"
+
+# Streaming counterpart of AGENT_CHAIN, empty unless streaming is enabled.
+# Queries are streamed whenever it is not empty.
+STREAM_AGENT_CHAIN: StreamAgentChain = ()
+
+# Outgoing messages buffered per connection. When a slow client lets the buffer
+# fill up, producers wait (pausing the LLM stream) instead of growing memory.
+OUTBOX_MAX_MESSAGES = 64
+# Draining more than this many pending messages at once means the client is slow
+OUTBOX_HIGH_WATER = 32
+
+# Frames larger than this are gzip-compressed and sent as binary messages
+COMPRESSION_THRESHOLD_BYTES = 4096
+
+# Agent answers being computed, keyed by query, so identical concurrent queries share one
+INFLIGHT_QUERIES: Dict[str, "asyncio.Task[str]"] = {}
 
 
 # Hardcoded responses for demo queries
@@ -129,6 +167,11 @@ Difference: €100/night (35.7% discount in off season)""",
 *Note: October is considered off season, and the premium triple room can accommodate up to 4 guests.*"""
 }
 
+# Key word sets for the partial matching, built once at import instead of per query
+HARDCODED_KEY_WORDS = [
+    (frozenset(key.split()), response) for key, response in HARDCODED_RESPONSES.items()
+]
+
 
 def find_matching_response(query: str) -> str:
     """
@@ -148,11 +191,8 @@ def find_matching_response(query: str) -> str:
         return HARDCODED_RESPONSES[query_lower]
     
     # Try partial matching
-    for key, response in HARDCODED_RESPONSES.items():
-        # Check if key words are present
-        key_words = set(key.split())
-        query_words = set(query_lower.split())
-        
+    query_words = set(query_lower.split())
+    for key_words, response in HARDCODED_KEY_WORDS:
         # If 60% or more of the key words are in the query
         if len(key_words.intersection(query_words)) / len(key_words) >= 0.6:
             return response
@@ -171,14 +211,325 @@ Example: "list the hotels in France" or "tell me the prices for triple premium r
 *This is a workshop starter - implement your LangChain agent here!*"""
 
 
+async def get_agent_response(uuid: str, user_query: str) -> str:
+    """
+    Answer a query, sharing the work between identical concurrent queries.
+
+    The first caller runs the agent chain in its own task; callers asking the
+    same query before it finishes await that task instead of invoking the
+    agents again. The task is shielded, so a caller that disconnects does not
+    cancel it for the others.
+
+    Args:
+        uuid (str): Unique identifier for the WebSocket connection.
+        user_query (str): User query string.
+
+    Returns:
+        str: Response content for the client.
+    """
+    task = INFLIGHT_QUERIES.get(user_query)
+    if task is None:
+        task = asyncio.create_task(run_agent_chain(uuid, user_query))
+        INFLIGHT_QUERIES[user_query] = task
+        task.add_done_callback(lambda _: INFLIGHT_QUERIES.pop(user_query, None))
+    else:
+        logger.info("Sharing in-flight answer with %s", uuid)
+    return await asyncio.shield(task)
+
+
+async def run_agent_chain(uuid: str, user_query: str) -> str:
+    """
+    Answer a query with the first agent in AGENT_CHAIN that succeeds.
+
+    An agent fails when it raises or returns an "error" result; the next one
+    is tried then. Falls back to the hardcoded responses when no agent is
+    available or every agent failed.
+
+    Args:
+        uuid (str): Unique identifier for the WebSocket connection.
+        user_query (str): User query string.
+
+    Returns:
+        str: Response content for the client.
+    """
+    for name, handler in AGENT_CHAIN:
+        try:
+            logger.info("Using %s agent for query: %.100s...", name, user_query)
+            result = await handler(user_query)
+        except Exception as e:
+            logger.error("❌ Error in %s agent: %s", name, e, exc_info=True)
+            continue
+
+        if result.status == "ok":
+            logger.info("✅ %s agent response generated successfully for %s", name, uuid)
+            return result.text
+        logger.warning("❌ %s agent returned an error for %s", name, uuid)
+
+    logger.warning("Falling back to hardcoded response for %s", uuid)
+    return find_matching_response(user_query)
+
+
+def decode_message(data: str):
+    """
+    Parse a JSON message received from the client.
+
+    Args:
+        data (str): Raw text of the WebSocket message.
+
+    Returns:
+        The decoded JSON value.
+
+    Raises:
+        json.JSONDecodeError: If the message is not valid JSON
+            (orjson's decode error is a subclass of it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_frame(payload: dict) -> bytes:
+    """
+    Serialize a message into a frame for the client.
+
+    Each WebSocket message carries exactly one JSON document, so no extra
+    delimiters are needed around it.
+
+    Args:
+        payload (dict): Message to send.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def coalesce_messages(messages: list) -> list:
+    """
+    Merge consecutive chunks of the same streamed answer into a single message.
+
+    Args:
+        messages (list): Outgoing messages, in order.
+
+    Returns:
+        list: Messages with adjacent chunks of each stream concatenated.
+    """
+    merged = []
+    for message in messages:
+        previous = merged[-1] if merged else None
+        if (previous is not None and message.get("stream_id")
+                and previous.get("stream_id") == message["stream_id"]):
+            merged[-1] = {
+                **previous,
+                "content": previous["content"] + message["content"],
+                "done": message["done"]
+            }
+        else:
+            merged.append(message)
+    return merged
+
+
+async def send_messages(websocket: WebSocket, uuid: str, outbox: asyncio.Queue) -> None:
+    """
+    Send queued messages to the client, batching whatever is pending.
+
+    Waits for the next message, then drains everything else already queued
+    without waiting, so a burst (e.g. fast streamed chunks) goes out as a
+    single frame while a lone message is sent immediately. The slower the
+    client, the more chunks accumulate and get merged into each frame.
+
+    If sending fails the queue keeps being drained (and discarded), so
+    producers never block on a dead connection; the receive loop notices
+    the disconnection and closes it.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection instance.
+        uuid (str): Unique identifier for the WebSocket connection.
+        outbox (asyncio.Queue): Messages produced for this connection.
+    """
+    connected = True
+    while True:
+        batch = [await outbox.get()]
+        while True:
+            try:
+                batch.append(outbox.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        if not connected:
+            continue
+
+        if len(batch) > OUTBOX_HIGH_WATER:
+            logger.warning(
+                "Slow WebSocket client %s: coalescing %d pending messages into one frame",
+                uuid, len(batch)
+            )
+
+        messages = coalesce_messages(batch)
+        if len(messages) == 1:
+            payload = messages[0]
+        else:
+            payload = {"role": "assistant", "messages": messages}
+        try:
+            await send_frame(websocket, encode_frame(payload))
+        except (WebSocketDisconnect, RuntimeError, ConnectionError) as e:
+            logger.error(
+                "Error sending to WebSocket for %s: %s",
+                uuid, str(e)
+            )
+            connected = False
+
+
+async def send_frame(websocket: WebSocket, frame: bytes) -> None:
+    """
+    Send a frame to the client, gzip-compressing large ones.
+
+    Small frames are sent as text to avoid compression overhead; large ones
+    (long markdown answers, tables) are sent as gzip binary messages, which the
+    client recognizes because text frames are never binary.
+
+    Args:
+        websocket (WebSocket): The WebSocket connection instance.
+        frame (bytes): UTF-8 encoded message frame.
+    """
+    if len(frame) > COMPRESSION_THRESHOLD_BYTES:
+        await websocket.send_bytes(gzip.compress(frame, compresslevel=1))
+    else:
+        await websocket.send_text(frame.decode("utf-8"))
+
+
+async def stream_agent_response(outbox: asyncio.Queue, uuid: str, user_query: str) -> None:
+    """
+    Stream the answer of the first agent in STREAM_AGENT_CHAIN that succeeds.
+
+    Every chunk is queued as an assistant message with the same ``stream_id`` so the
+    client appends it to a single chat bubble; a final message with ``done`` set
+    closes the stream.
+
+    An agent that fails before its first chunk is skipped like in run_agent_chain,
+    and the hardcoded response is streamed when every agent failed. Once part of
+    an answer was sent, a failure is reported below it instead.
+
+    Args:
+        outbox (asyncio.Queue): Outgoing messages of the WebSocket connection.
+        uuid (str): Unique identifier for the WebSocket connection.
+        user_query (str): User query string.
+    """
+    stream_id = uuid_lib.uuid4().hex
+
+    async def send_chunk(content: str) -> None:
+        await outbox.put({
+            "role": "assistant",
+            "content": content,
+            "stream_id": stream_id,
+            "done": False
+        })
+
+    for name, stream_handler in STREAM_AGENT_CHAIN:
+        started = False
+        try:
+            logger.info("Streaming %s agent response for %s", name, uuid)
+            async for chunk in stream_handler(user_query):
+                started = True
+                await send_chunk(chunk)
+        except AgentError as e:
+            # Already logged by the agent
+            error_message = e.result.text
+        except Exception as e:
+            logger.error("❌ Error in %s agent: %s", name, e, exc_info=True)
+            error_message = f"❌ **Error**: {e}"
+        else:
+            break
+
+        if started:
+            # Part of the answer is already on screen: report the error below it
+            await send_chunk(f"\n\n{error_message}")
+            break
+        logger.warning("❌ %s agent returned an error for %s", name, uuid)
+    else:
+        logger.warning("Falling back to hardcoded response for %s", uuid)
+        await send_chunk(find_matching_response(user_query))
+
+    await outbox.put({
+        "role": "assistant",
+        "content": "",
+        "stream_id": stream_id,
+        "done": True
+    })
+    logger.info("Finished streaming response to %s", uuid)
+
+
+def build_stream_agent_chain() -> StreamAgentChain:
+    """
+    Build the ordered streaming agent chain from the availability flags.
+
+    Returns:
+        StreamAgentChain: (name, stream handler) pairs of the available agents,
+        or an empty chain when streaming is disabled.
+    """
+    if not STREAMING_ENABLED:
+        return ()
+    return tuple(
+        agent for agent in (
+            ("Exercise 0", stream_hotel_answer) if EXERCISE_0_AVAILABLE else None,
+        ) if agent is not None
+    )
+
+
+def build_agent_chain() -> AgentChain:
+    """
+    Build the ordered agent chain from the availability flags.
+
+    Returns:
+        AgentChain: (name, handler) pairs of the available agents.
+    """
+    return tuple(
+        agent for agent in (
+            ("Exercise 0", answer_hotel_question_result_async) if EXERCISE_0_AVAILABLE else None,
+        ) if agent is not None
+    )
+
+
+async def verify_exercise_0() -> bool:
+    """
+    Check that the Exercise 0 agent can be used by loading its hotel data.
+
+    The files are read in a worker thread so the event loop is never blocked.
+
+    Returns:
+        bool: True if the agent was imported and its hotel data loaded.
+    """
+    if not EXERCISE_0_IMPORTED:
+        return False
+    try:
+        await asyncio.to_thread(load_hotel_data)
+    except Exception as e:
+        logger.warning(f"Exercise 0 agent code loaded but data/files not ready: {e}")
+        logger.warning("Will use hardcoded responses until hotel data is available")
+        return False
+    logger.info("✅ Exercise 0 agent loaded successfully and hotel data verified")
+    return True
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan event handler for startup and shutdown logic.
     """
+    global EXERCISE_0_AVAILABLE, AGENT_CHAIN, STREAM_AGENT_CHAIN
+
     logger.info("Starting AI Hospitality API...")
+    EXERCISE_0_AVAILABLE = await verify_exercise_0()
+    if EXERCISE_0_AVAILABLE:
+        await asyncio.to_thread(enable_llm_cache)
+    AGENT_CHAIN = build_agent_chain()
+    STREAM_AGENT_CHAIN = build_stream_agent_chain()
     yield
     logger.info("Shutting down AI Hospitality API...")
+    if EXERCISE_0_IMPORTED:
+        await close_http_clients()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -218,34 +569,30 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
     await websocket.accept()
     logger.info("WebSocket connection opened for %s", uuid)
 
+    # Outgoing messages are queued and written by a dedicated sender task
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=OUTBOX_MAX_MESSAGES)
+    sender_task = asyncio.create_task(send_messages(websocket, uuid, outbox))
+
     try:
         while True:
             try:
                 # Receive message from client
                 data = await websocket.receive_text()
-                logger.info(f"Received from {uuid}: {data}")
+                logger.info("Received from %s: %s", uuid, data)
                 
                 # Parse the query
                 try:
-                    message_data = json.loads(data)
+                    message_data = decode_message(data)
                     user_query = message_data.get("content", data)
                 except json.JSONDecodeError:
                     user_query = data
                 
-                # Get response from Exercise 0 agent or fallback to hardcoded
-                if EXERCISE_0_AVAILABLE:
-                    try:
-                        logger.info(f"Using Exercise 0 agent for query: {user_query[:100]}...")
-                        response_content = await handle_hotel_query_simple(user_query)
-                        logger.info(f"✅ Exercise 0 agent response generated successfully for {uuid}")
-                    except Exception as e:
-                        logger.error(f"❌ Error in Exercise 0 agent: {e}", exc_info=True)
-                        logger.warning(f"Falling back to hardcoded response for {uuid}")
-                        response_content = find_matching_response(user_query)
-                else:
-                    # Fallback to hardcoded responses
-                    logger.debug(f"Using hardcoded responses (Exercise 0 not available) for {uuid}")
-                    response_content = find_matching_response(user_query)
+                if STREAM_AGENT_CHAIN:
+                    await stream_agent_response(outbox, uuid, user_query)
+                    continue
+                
+                # Get response from the agent chain or fallback to hardcoded
+                response_content = await get_agent_response(uuid, user_query)
                 
                 # Send response back to client
                 agent_message = {
@@ -253,10 +600,8 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
                     "content": response_content
                 }
                 
-                await websocket.send_text(
-                    f"JSONSTART{json.dumps(agent_message)}JSONEND"
-                )
-                logger.info(f"Sent response to {uuid}")
+                await outbox.put(agent_message)
+                logger.info("Queued response to %s", uuid)
                 
             except WebSocketDisconnect:
                 logger.info("WebSocket connection closed for %s", uuid)
@@ -273,6 +618,16 @@ async def websocket_endpoint(websocket: WebSocket, uuid: str):
             uuid, str(e)
         )
     finally:
+        sender_task.cancel()
+        try:
+            await sender_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(
+                "Unexpected error in WebSocket sender for %s: %s",
+                uuid, str(e)
+            )
         try:
             await websocket.close()
         except (RuntimeError, ConnectionError) as e:
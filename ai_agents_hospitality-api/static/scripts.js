@@ -1,13 +1,60 @@
 let previousTimestamp = null;  
 const ws = new WebSocket("ws://0.0.0.0:8001/ws/fdfb8545-c177-48a2-bdce-b06af2032092_test_poc");
+// Streamed answers in progress: stream_id -> {element, text}
+const activeStreams = {};
+  
+// Frames are handled strictly in arrival order, even when one needs async decompression
+let receiveChain = Promise.resolve();
   
 ws.onmessage = function(event) {  
-    const messages = document.getElementById('messages');  
-    const data = event.data;
-    const jsonStr = data.substring(data.indexOf("JSONSTART") + 9, data.indexOf("JSONEND"));
-    const messageData = JSON.parse(jsonStr);
+    receiveChain = receiveChain
+        .then(() => readFrame(event.data))
+        .then(handleFrame)
+        .catch(error => console.error('Error handling message:', error));
+};
+
+async function readFrame(data) {
+    // Large frames arrive as gzip-compressed binary messages
+    if (data instanceof Blob) {
+        const stream = data.stream().pipeThrough(new DecompressionStream('gzip'));
+        return await new Response(stream).text();
+    }
+    return data;
+}
+
+function handleFrame(data) {
+    const payload = JSON.parse(data);
     
-    console.log('Received message:', messageData);
+    console.log('Received message:', payload);
+    // The server batches messages that were pending at the same time
+    const batch = payload.messages || [payload];
+    batch.forEach(renderServerMessage);
+    scrollToBottom();  
+}
+
+function renderServerMessage(messageData) {
+    const md = window.markdownit();  
+
+    // Chunks of a streamed answer are appended to the same message bubble
+    const stream = messageData.stream_id ? activeStreams[messageData.stream_id] : null;
+    if (stream) {
+        stream.text += messageData.content;
+        stream.element.innerHTML = md.render(stream.text);
+        if (messageData.done) {
+            delete activeStreams[messageData.stream_id];
+        }
+        return;
+    }
+
+    const message = appendServerMessage(messageData);
+    message.innerHTML = md.render(messageData.content);
+    if (messageData.stream_id && !messageData.done) {
+        activeStreams[messageData.stream_id] = {element: message, text: messageData.content};
+    }
+}
+
+function appendServerMessage(messageData) {
+    const messages = document.getElementById('messages');  
     const currentTimestamp = messageData.timestamp;  
     const showTimestamp = previousTimestamp  
         ? (currentTimestamp - previousTimestamp >= 300)  
@@ -35,14 +82,12 @@ ws.onmessage = function(event) {
   
     const message = document.createElement('li');  
     message.classList.add('server-message');  
-    const md = window.markdownit();  
-    message.innerHTML = md.render(messageData.content);  
     messageWrapper.appendChild(icon);  
     messageWrapper.appendChild(role);  
     messageWrapper.appendChild(message);  
     messages.appendChild(messageWrapper);  
-    scrollToBottom();  
-};
+    return message;
+}
   
 function sendMessage(event) {  
     const input = document.getElementById("messageText");  
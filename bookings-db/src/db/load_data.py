@@ -1,11 +1,60 @@
 #!/usr/bin/env python3
 """Script to load booking data from Excel into PostgreSQL database."""
 
+import io
 import os
+import time
 import pandas as pd
 import psycopg2
 from psycopg2 import OperationalError, DatabaseError
 
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+# Excel columns in the same order as the COPY column list
+BOOKING_COLUMNS = [
+    'Hotel Name', 'Room ID', 'Room Type', 'Room Category',
+    'Check-in Date', 'Check-out Date', 'Total Nights',
+    'Guest First Name', 'Guest Last Name', 'Guest Email', 'Guest Phone',
+    'Guest Country', 'Guest City', 'Guest Address', 'Guest Zip Code',
+    'Meal Plan', 'Total Price'
+]
+
+# Columns read from the Excel export; 'Total Nights' is derived below
+EXCEL_COLUMNS = [column for column in BOOKING_COLUMNS if column != 'Total Nights']
+
+# Prefer the Rust-based calamine reader, falling back to openpyxl
+EXCEL_ENGINE = "calamine" if python_calamine is not None else "openpyxl"
+
+# Connection attempts before giving up, and the delay between them in seconds
+CONNECT_ATTEMPTS = 5
+CONNECT_RETRY_DELAY = 1
+
+def connect_with_retry():
+    """Connect to PostgreSQL, retrying while the server is not accepting connections yet."""
+    for attempt in range(1, CONNECT_ATTEMPTS + 1):
+        try:
+            return psycopg2.connect(
+                host="bookings-db",
+                database=os.getenv('POSTGRES_DB'),
+                user=os.getenv('POSTGRES_USER'),
+                password=os.getenv('POSTGRES_PASSWORD')
+            )
+        except OperationalError as error:
+            if attempt == CONNECT_ATTEMPTS:
+                raise
+            print(f"PostgreSQL not ready (attempt {attempt}/{CONNECT_ATTEMPTS}): {error}")
+            time.sleep(CONNECT_RETRY_DELAY * attempt)
+
+def bookings_to_csv(df):
+    """Render the booking rows as an in-memory CSV in COPY column order."""
+    buffer = io.StringIO()
+    df[BOOKING_COLUMNS].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    return buffer
+
 def check_table_exists(cursor, table_name):
     """Check if a table exists in the database."""
     cursor.execute("""
@@ -24,53 +73,45 @@ def execute_sql_file(cursor, file_path):
 
 def load_excel_to_postgres():
     """Load booking data from Excel file into PostgreSQL database."""
+    conn = None
     try:
         # Connect to PostgreSQL using environment variables
-        conn = psycopg2.connect(
-            host="bookings-db",
-            database=os.getenv('POSTGRES_DB'),
-            user=os.getenv('POSTGRES_USER'),
-            password=os.getenv('POSTGRES_PASSWORD')
-        )
+        conn = connect_with_retry()
 
         # Create a cursor
         cursor = conn.cursor()
 
+        # Run the whole load as one transaction; it is rerun from scratch
+        # on failure, so there is no need to wait for the WAL flush on commit
+        cursor.execute("SET LOCAL synchronous_commit = OFF")
+
         # Check if table exists and create it if it doesn't
         if not check_table_exists(cursor, 'bookings'):
             print("Table 'bookings' does not exist. Creating it...")
             execute_sql_file(cursor, '/app/db/init.sql')
-            conn.commit()
 
         # Read the Excel file
         excel_file = "/app/data/all_bookings.xlsx"
-        df = pd.read_excel(excel_file)
+        df = pd.read_excel(excel_file, engine=EXCEL_ENGINE, usecols=EXCEL_COLUMNS)
 
         # Convert date columns to datetime
-        df['Check-in Date'] = pd.to_datetime(df['Check-in Date'])
-        df['Check-out Date'] = pd.to_datetime(df['Check-out Date'])
+        df['Check-in Date'] = pd.to_datetime(df['Check-in Date'], format="ISO8601")
+        df['Check-out Date'] = pd.to_datetime(df['Check-out Date'], format="ISO8601")
         
         # Calculate total nights
         df['Total Nights'] = (df['Check-out Date'] - df['Check-in Date']).dt.days
 
-        # Insert data into the database
-        for _, row in df.iterrows():
-            cursor.execute("""
-                INSERT INTO bookings (
-                    hotel_name, room_id, room_type, room_category,
-                    check_in_date, check_out_date, total_nights, guest_first_name,
-                    guest_last_name, guest_email, guest_phone,
-                    guest_country, guest_city, guest_address,
-                    guest_zip_code, meal_plan, total_price
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                row['Hotel Name'], row['Room ID'], row['Room Type'],
-                row['Room Category'], row['Check-in Date'], row['Check-out Date'],
-                row['Total Nights'], row['Guest First Name'], row['Guest Last Name'], row['Guest Email'],
-                row['Guest Phone'], row['Guest Country'], row['Guest City'],
-                row['Guest Address'], row['Guest Zip Code'], row['Meal Plan'],
-                row['Total Price']
-            ))
+        # Stream the data into the database with a single COPY instead of
+        # one INSERT per row
+        cursor.copy_expert("""
+            COPY bookings (
+                hotel_name, room_id, room_type, room_category,
+                check_in_date, check_out_date, total_nights, guest_first_name,
+                guest_last_name, guest_email, guest_phone,
+                guest_country, guest_city, guest_address,
+                guest_zip_code, meal_plan, total_price
+            ) FROM STDIN WITH (FORMAT csv)
+        """, bookings_to_csv(df))
 
         # Commit the transaction
         conn.commit()
@@ -78,6 +119,8 @@ def load_excel_to_postgres():
 
     except (OperationalError, DatabaseError, FileNotFoundError, ValueError) as error:
         print(f"Error while connecting to PostgreSQL: {error}")
+        if conn:
+            conn.rollback()
     finally:
         if conn:
             cursor.close()
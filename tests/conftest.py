@@ -0,0 +1,18 @@
+"""
+Shared pytest setup.
+
+Makes the API package and the bookings loader importable from the repository
+root, and keeps the hotel agent from warming up (building an LLM client) in a
+background thread as soon as it is imported.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+os.environ["HOSPITALITY_WARMUP"] = "0"
+
+sys.path.insert(0, str(REPO_ROOT / "bookings-db" / "src" / "db"))
+sys.path.insert(0, str(REPO_ROOT / "ai_agents_hospitality-api"))
@@ -0,0 +1,119 @@
+"""Tests for the hotel agent's answer cache and result handling, with a fake LLM."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from agents import hotel_simple_agent as agent
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+
+@pytest.fixture
+def answer_cache(monkeypatch):
+    """Enable an empty answer cache with a controllable clock."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(agent, "ANSWER_CACHE_ENABLED", True)
+    monkeypatch.setattr(agent, "_answer_cache", {})
+    monkeypatch.setattr(agent, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def _use_fake_llm(monkeypatch, responses):
+    llm = FakeListChatModel(responses=responses)
+    chain = ChatPromptTemplate.from_messages([("human", "{question}")]) | llm
+    monkeypatch.setattr(agent, "_agent_chain", chain)
+
+
+def test_normalized_variants_share_a_cache_key():
+    assert agent._normalize_question("  What are the HOTELS   in Paris?? ") == (
+        "what are the hotels in paris"
+    )
+    assert agent._answer_cache_key("Hotels in Paris?") == agent._answer_cache_key(
+        "hotels, in paris"
+    )
+
+    must_not_collide = [
+        ("hotels in paris", "hotels in nice"),
+        ("rooms under €100", "rooms under $100"),
+        ("rooms under €100", "rooms under £100"),
+        ("rooms for > 4 guests", "rooms for 4 guests"),
+        ("rooms for < 4 guests", "rooms for > 4 guests"),
+        ("10% discount", "10 discount"),
+        ("rooms under €99.50", "rooms under €9950"),
+    ]
+    for question, other in must_not_collide:
+        assert agent._answer_cache_key(question) != agent._answer_cache_key(other), question
+
+
+def test_cached_answer_expires_after_ttl(answer_cache):
+    agent._store_cached_answer("key", "answer")
+
+    answer_cache.now += agent.ANSWER_CACHE_TTL_SECONDS
+    assert agent._get_cached_answer("key") == "answer"
+
+    answer_cache.now += 1
+    assert agent._get_cached_answer("key") is None
+    assert "key" not in agent._answer_cache
+
+
+def test_oldest_entries_are_evicted_when_full(answer_cache, monkeypatch):
+    monkeypatch.setattr(agent, "ANSWER_CACHE_MAX_ENTRIES", 2)
+
+    agent._store_cached_answer("a", "1")
+    agent._store_cached_answer("b", "2")
+    # Storing an existing key again makes it the newest entry
+    agent._store_cached_answer("a", "1")
+    agent._store_cached_answer("c", "3")
+
+    assert list(agent._answer_cache) == ["a", "c"]
+
+
+def test_ok_answers_are_cached(answer_cache, monkeypatch):
+    _use_fake_llm(monkeypatch, ["first answer", "second answer"])
+
+    first = asyncio.run(agent.answer_hotel_question_result_async("Hotels in Paris?"))
+    second = asyncio.run(agent.answer_hotel_question_result_async("hotels in paris"))
+
+    assert first == agent.AgentResult("ok", "first answer")
+    assert second == agent.AgentResult("ok", "first answer")
+
+
+def test_errors_are_reported_and_not_cached(answer_cache, monkeypatch):
+    async def failing_chain():
+        raise ValueError("API key is required")
+
+    monkeypatch.setattr(agent, "_get_agent_chain_async", failing_chain)
+
+    result = asyncio.run(agent.answer_hotel_question_result_async("hotels in paris"))
+
+    assert result.status == "error"
+    assert result.text.startswith("❌ **Error**: API key is required")
+    assert agent._answer_cache == {}
+
+
+def test_streamed_answer_is_cached_once_complete(answer_cache, monkeypatch):
+    _use_fake_llm(monkeypatch, ["streamed answer"])
+
+    async def collect(question):
+        return [chunk async for chunk in agent.stream_hotel_answer(question)]
+
+    chunks = asyncio.run(collect("hotels in nice"))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "streamed answer"
+    assert asyncio.run(collect("Hotels in Nice?")) == ["streamed answer"]
+
+
+def test_async_http_clients_are_closed_at_shutdown(monkeypatch):
+    monkeypatch.setattr(agent, "_async_http_clients", [])
+
+    async def build_and_close():
+        http_async_client = agent._openai_http_clients()["http_async_client"]
+        await agent.close_http_clients()
+        return http_async_client
+
+    http_async_client = asyncio.run(build_and_close())
+
+    assert http_async_client.is_closed
+    assert agent._async_http_clients == []
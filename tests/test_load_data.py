@@ -0,0 +1,68 @@
+"""Tests for the CSV rendering used by the bookings COPY loader."""
+
+import csv
+
+import pandas as pd
+from load_data import BOOKING_COLUMNS, bookings_to_csv
+
+
+def _booking(**overrides):
+    booking = {
+        'Hotel Name': "Grand Victoria",
+        'Room ID': "01-001",
+        'Room Type': "Double",
+        'Room Category': "Standard",
+        'Check-in Date': pd.Timestamp("2025-03-01"),
+        'Check-out Date': pd.Timestamp("2025-03-04"),
+        'Total Nights': 3,
+        'Guest First Name': "Ana",
+        'Guest Last Name': "García",
+        'Guest Email': "ana@example.com",
+        'Guest Phone': "+34 600 000 000",
+        'Guest Country': "Spain",
+        'Guest City': "Madrid",
+        'Guest Address': "Calle Mayor 1",
+        'Guest Zip Code': "28013",
+        'Meal Plan': "Room Only",
+        'Total Price': 540.5,
+        'Unused Column': "ignored",
+    }
+    booking.update(overrides)
+    return booking
+
+
+def test_rows_follow_copy_column_order():
+    df = pd.DataFrame([_booking()])
+
+    rows = list(csv.reader(bookings_to_csv(df)))
+
+    assert rows == [[
+        "Grand Victoria", "01-001", "Double", "Standard",
+        "2025-03-01", "2025-03-04", "3",
+        "Ana", "García", "ana@example.com", "+34 600 000 000",
+        "Spain", "Madrid", "Calle Mayor 1", "28013",
+        "Room Only", "540.5",
+    ]]
+    assert len(rows[0]) == len(BOOKING_COLUMNS)
+
+
+def test_delimiters_and_quotes_in_values_are_escaped():
+    address = 'Rue de "Rivoli", 12\nBâtiment A'
+    df = pd.DataFrame([_booking(**{'Guest Address': address})])
+
+    rows = list(csv.reader(bookings_to_csv(df)))
+
+    assert len(rows) == 1
+    assert rows[0][BOOKING_COLUMNS.index('Guest Address')] == address
+
+
+def test_missing_values_are_written_as_empty_fields():
+    df = pd.DataFrame([_booking(**{'Guest Zip Code': None, 'Total Price': float("nan")})])
+
+    line = bookings_to_csv(df).read().rstrip("\n")
+
+    fields = next(csv.reader([line]))
+    assert fields[BOOKING_COLUMNS.index('Guest Zip Code')] == ""
+    assert fields[BOOKING_COLUMNS.index('Total Price')] == ""
+    # Unquoted empty fields, which COPY ... (FORMAT csv) reads as NULL
+    assert ',"",' not in line and not line.endswith(',""')
@@ -0,0 +1,194 @@
+"""Tests for the WebSocket message path of the API: dispatch, batching and framing."""
+
+import asyncio
+import gzip
+import json
+
+import main
+from agents import hotel_simple_agent
+from agents.hotel_simple_agent import AgentError, AgentResult
+
+
+class FakeWebSocket:
+    """Records the frames sent to it; optionally fails every send."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.text_frames = []
+        self.binary_frames = []
+
+    async def send_text(self, data):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.text_frames.append(data)
+
+    async def send_bytes(self, data):
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.binary_frames.append(data)
+
+
+def _chunk(stream_id, content, done=False):
+    return {"role": "assistant", "content": content, "stream_id": stream_id, "done": done}
+
+
+def test_coalesce_merges_adjacent_chunks_of_the_same_stream():
+    plain = {"role": "assistant", "content": "hello"}
+    messages = [
+        _chunk("a", "Hel"), _chunk("a", "lo"), _chunk("b", "other"),
+        _chunk("a", "!"), _chunk("a", "", done=True), plain,
+    ]
+
+    assert main.coalesce_messages(messages) == [
+        _chunk("a", "Hello"), _chunk("b", "other"), _chunk("a", "!", done=True), plain,
+    ]
+
+
+def test_small_frames_are_sent_as_text():
+    websocket = FakeWebSocket()
+    frame = main.encode_frame({"role": "assistant", "content": "short"})
+
+    asyncio.run(main.send_frame(websocket, frame))
+
+    assert websocket.text_frames == [frame.decode()]
+    assert websocket.binary_frames == []
+
+
+def test_large_frames_are_gzipped_and_sent_as_binary():
+    websocket = FakeWebSocket()
+    content = "x" * (main.COMPRESSION_THRESHOLD_BYTES + 1)
+    frame = main.encode_frame({"role": "assistant", "content": content})
+
+    asyncio.run(main.send_frame(websocket, frame))
+
+    assert websocket.text_frames == []
+    assert [gzip.decompress(data) for data in websocket.binary_frames] == [frame]
+
+
+def test_pending_messages_are_sent_as_one_batch():
+    websocket = FakeWebSocket()
+    plain = {"role": "assistant", "content": "hello"}
+
+    async def run():
+        outbox = asyncio.Queue(maxsize=main.OUTBOX_MAX_MESSAGES)
+        for message in (_chunk("a", "Hel"), _chunk("a", "lo"), _chunk("a", "", True), plain):
+            outbox.put_nowait(message)
+        sender = asyncio.create_task(main.send_messages(websocket, "uuid", outbox))
+        await asyncio.sleep(0.01)
+        sender.cancel()
+
+    asyncio.run(run())
+
+    assert [json.loads(frame) for frame in websocket.text_frames] == [{
+        "role": "assistant",
+        "messages": [_chunk("a", "Hello", done=True), plain],
+    }]
+
+
+def test_outbox_keeps_draining_after_a_send_failure():
+    websocket = FakeWebSocket(fail=True)
+
+    async def run():
+        outbox = asyncio.Queue(maxsize=2)
+        sender = asyncio.create_task(main.send_messages(websocket, "uuid", outbox))
+        # Producers must not block on the bounded outbox of a dead connection
+        for i in range(10):
+            await asyncio.wait_for(outbox.put({"role": "assistant", "content": str(i)}), 1)
+        sender.cancel()
+
+    asyncio.run(run())
+
+
+def test_falls_back_when_the_agent_returns_an_error(monkeypatch):
+    async def failing_agent(query):
+        return AgentResult("error", "❌ **Error**: API key is required")
+
+    monkeypatch.setattr(main, "AGENT_CHAIN", (("Failing", failing_agent),))
+
+    response = asyncio.run(main.get_agent_response("uuid", "list the hotels in france"))
+
+    assert response == main.HARDCODED_RESPONSES["list the hotels in france"]
+
+
+def _stream(user_query):
+    """Run stream_agent_response and return the contents it queued and the last message."""
+    async def run():
+        outbox = asyncio.Queue()
+        await main.stream_agent_response(outbox, "uuid", user_query)
+        return [outbox.get_nowait() for _ in range(outbox.qsize())]
+
+    messages = asyncio.run(run())
+    assert len({message["stream_id"] for message in messages}) == 1
+    return [message["content"] for message in messages], messages[-1]
+
+
+def test_stream_falls_back_when_the_agent_fails_before_answering(monkeypatch):
+    async def missing_api_key():
+        raise ValueError("API key is required")
+
+    monkeypatch.setattr(hotel_simple_agent, "_get_agent_chain_async", missing_api_key)
+    monkeypatch.setattr(
+        main, "STREAM_AGENT_CHAIN", (("Exercise 0", hotel_simple_agent.stream_hotel_answer),)
+    )
+
+    contents, last = _stream("list the hotels in france")
+
+    assert "".join(contents) == main.HARDCODED_RESPONSES["list the hotels in france"]
+    assert last["done"] is True
+
+
+def test_stream_reports_errors_after_the_first_chunk(monkeypatch):
+    async def interrupted_agent(query):
+        yield "Partial answer"
+        raise AgentError(AgentResult("error", "❌ **Error**: connection lost"))
+
+    monkeypatch.setattr(main, "STREAM_AGENT_CHAIN", (("Interrupted", interrupted_agent),))
+
+    contents, last = _stream("list the hotels in france")
+
+    assert contents == ["Partial answer", "\n\n❌ **Error**: connection lost", ""]
+    assert last["done"] is True
+
+
+def test_next_agent_is_tried_when_one_raises(monkeypatch):
+    async def raising_agent(query):
+        raise RuntimeError("boom")
+
+    async def working_agent(query):
+        return AgentResult("ok", f"answer to {query}")
+
+    monkeypatch.setattr(
+        main, "AGENT_CHAIN", (("Raising", raising_agent), ("Working", working_agent))
+    )
+
+    assert asyncio.run(main.get_agent_response("uuid", "q")) == "answer to q"
+
+
+def test_identical_concurrent_queries_share_one_agent_call(monkeypatch):
+    calls = []
+
+    async def slow_agent(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return AgentResult("ok", f"answer to {query}")
+
+    monkeypatch.setattr(main, "AGENT_CHAIN", (("Slow", slow_agent),))
+
+    async def run():
+        first = asyncio.create_task(main.get_agent_response("a", "same"))
+        # A caller that disconnects must not cancel the shared answer
+        cancelled = asyncio.create_task(main.get_agent_response("b", "same"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        answers = await asyncio.gather(
+            first,
+            main.get_agent_response("c", "same"),
+            main.get_agent_response("d", "other"),
+        )
+        return answers
+
+    answers = asyncio.run(run())
+
+    assert answers == ["answer to same", "answer to same", "answer to other"]
+    assert calls == ["same", "other"]
+    assert main.INFLIGHT_QUERIES == {}